@@ -0,0 +1,17 @@
+# gunicorn -c gunicorn.conf.py "main:configure_app()"
+#
+# The app is imported and configured once in the parent (--preload) and the
+# workers fork from it. Threads and db connections do not survive a fork, so
+# every worker starts its own background services and connection pool.
+
+bind            = "127.0.0.1:8000"
+workers         = 3
+preload_app     = True
+
+
+def post_fork(server, worker):
+    import main
+
+    with main.app.app_context():
+        main.db.engine.dispose(close=False)
+    main.start_background_services()
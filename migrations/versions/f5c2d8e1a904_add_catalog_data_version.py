@@ -0,0 +1,28 @@
+"""add catalog row to data_version
+
+Revision ID: f5c2d8e1a904
+Revises: e37a9b0c4d18
+Create Date: 2026-10-18 13:32:45.901126
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f5c2d8e1a904'
+down_revision = 'e37a9b0c4d18'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    data_version = sa.table('data_version',
+        sa.column('name', sa.String),
+        sa.column('version', sa.Integer)
+    )
+    op.bulk_insert(data_version, [{'name': 'catalog', 'version': 1}])
+
+
+def downgrade():
+    op.execute("DELETE FROM data_version WHERE name = 'catalog'")
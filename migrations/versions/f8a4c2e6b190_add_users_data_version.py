@@ -0,0 +1,28 @@
+"""add users row to data_version
+
+Revision ID: f8a4c2e6b190
+Revises: e6c1a9b3d472
+Create Date: 2026-10-19 11:20:37.264815
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f8a4c2e6b190'
+down_revision = 'e6c1a9b3d472'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    data_version = sa.table('data_version',
+        sa.column('name', sa.String),
+        sa.column('version', sa.Integer)
+    )
+    op.bulk_insert(data_version, [{'name': 'users', 'version': 1}])
+
+
+def downgrade():
+    op.execute("DELETE FROM data_version WHERE name = 'users'")
@@ -182,7 +182,7 @@ function setupCalendar(booking_dates){
 
 /**
  * Initialize Flatpickr date pickers and apply disabled dates.
- * Example disabled dates: ["2023-01-01", "2023-01-02"]
+ * Example disabled dates: [{"from": "2023-01-01", "to": "2023-01-04"}]
  */
 function initDatePickers(){
 
@@ -266,11 +266,11 @@ function loadBorrowerInfo(form, info){
 /**
  * Set the value of booked dates into the form's hidden field.
  * @param {HTMLFormElement} form - The form element.
- * @param {string} booked_dates - A JSON string of disabled/used dates.
+ * @param {string|Array<Object>} booked_dates - Booked date ranges, or their JSON string.
  */
 function loadBookedDatesInfo(form, booked_dates){
     try{
-        form.elements["booked_dates"].value = booked_dates;
+        form.elements["booked_dates"].value = bookedDatesToString(booked_dates);
     }
     catch (error){
         console.log(error);
@@ -377,10 +377,20 @@ function updateJSON(form, items_json){
 /**
  * Update the booked_dates hidden input in the form.
  * @param {HTMLFormElement} form - The target form.
- * @param {string} booked_dates - JSON string representing disabled dates.
+ * @param {string|Array<Object>} booked_dates - Booked date ranges, or their JSON string.
  */
 function updateBookedDates(form, booked_dates){
-    form.elements['booked_dates'].value = booked_dates;
+    form.elements['booked_dates'].value = bookedDatesToString(booked_dates);
+}
+
+/**
+ * Booked date ranges come as {from, to} objects that flatpickr can disable directly.
+ * Hidden inputs hold them as a JSON string.
+ * @param {string|Array<Object>} booked_dates - Ranges or their JSON string.
+ * @returns {string} - JSON string of the ranges.
+ */
+function bookedDatesToString(booked_dates){
+    return typeof booked_dates === 'string' ? booked_dates : JSON.stringify(booked_dates || []);
 }
 
 /**
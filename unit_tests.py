@@ -1,19 +1,592 @@
 import unittest
-from flask import url_for
-from main import app, db  # adjust to your actual entry point
+from unittest import mock
+import os
+import tempfile
+import base64
+import json
+import time
+import socket
+import sys
+import threading
+from urllib.parse import urlparse, parse_qs
+from flask import url_for, render_template
+from datetime import datetime, timedelta
+from main import configure_app, db, get_items_availability, BookingIntervals, validate_cart_lines, FileTransport, SCHEDULED_JOBS, SchedulerLeader, RequestProfile, Metrics, reset_msal_app, ics_line, photo_srcset, count_bookings, BOOKINGS_COUNTS_MAX, Booking, User, Item, EmailOutbox, ReminderLedger, check_and_send_reminders_tomorrow, get_catalog, bump_data_version, _claim_reminders, Cart, CartLine, purge_stale_carts, BookingArchive, promote_item_statuses  # adjust to your actual entry point
+import main
 from flask.testing import FlaskClient
+from sqlalchemy import event
+from sqlalchemy.exc import OperationalError
+from apscheduler.triggers.cron import CronTrigger
+
+class StubResponse:
+
+    def __init__(self, payload):
+        self.status_code    = 200
+        self.headers        = {}
+        self.text           = json.dumps(payload)
+
+    def raise_for_status(self):
+        pass
+
+
+class StubAuthority:
+    """MSAL http client answering discovery and token requests in-process"""
+
+    def __init__(self, authority, client_id):
+        self.authority  = authority
+        self.client_id  = client_id
+        self.nonce      = None
+        self.requests   = []
+
+    def get(self, url, **kwargs):
+        self.requests.append(url)
+        return StubResponse({
+            "authorization_endpoint": f"{self.authority}/oauth2/v2.0/authorize",
+            "token_endpoint"        : f"{self.authority}/oauth2/v2.0/token",
+            "issuer"                : self.authority,
+        })
+
+    def post(self, url, **kwargs):
+        self.requests.append(url)
+        claims = {"iss": self.authority, "aud": self.client_id, "sub": "stub", "iat": int(time.time()),
+                  "exp": int(time.time()) + 3600, "nonce": self.nonce, "name": "Stub User",
+                  "preferred_username": "stub.user@lmta.lt"}
+        encode = lambda part: base64.urlsafe_b64encode(json.dumps(part).encode()).decode().rstrip("=")
+        return StubResponse({"token_type": "Bearer", "access_token": "stub", "expires_in": 3600,
+                             "id_token": f'{encode({"alg": "none"})}.{encode(claims)}.'})
+
 
 class FlaskAppTests(unittest.TestCase):
 
     def setUp(self):
-        self.app = app
-        self.app.config['TESTING'] = True
+        self.app = configure_app({'TESTING': True, 'BACKGROUND_SERVICES': False})
         self.client: FlaskClient = self.app.test_client()
 
+    def add_rows(self, *rows):
+        """Commit rows for one test, deleted again when it ends. Returns their ids."""
+        with self.app.app_context():
+            db.session.add_all(rows)
+            db.session.commit()
+            keys = [(type(row), row.id) for row in rows]
+        self.addCleanup(self.delete_rows, keys)
+        return [row_id for _, row_id in keys]
+
+    def delete_rows(self, keys):
+        with self.app.app_context():
+            for model, row_id in reversed(keys):
+                row = db.session.get(model, row_id)
+                if row is not None:
+                    db.session.delete(row)
+            db.session.commit()
+
+    def login(self, user_id):
+        with self.client.session_transaction() as client_session:
+            client_session['_user_id'] = str(user_id)
+            client_session['_fresh']   = True
+
     def test_home(self):
         response = self.client.get('/')
         self.assertEqual(response.status_code, 200)
 
+    def test_items_availability_empty(self):
+        with self.app.app_context():
+            self.assertEqual(get_items_availability([]), ([], []))
+
+    def test_booking_intervals_overlap(self):
+        intervals = BookingIntervals([
+            (datetime(2025, 1, 10), datetime(2025, 1, 12)),
+            (datetime(2025, 1, 1),  datetime(2025, 1, 3)),
+        ])
+        self.assertTrue(intervals.overlaps(datetime(2025, 1, 3), datetime(2025, 1, 5)))
+        self.assertTrue(intervals.overlaps(datetime(2025, 1, 11), datetime(2025, 1, 11)))
+        self.assertFalse(intervals.overlaps(datetime(2025, 1, 4), datetime(2025, 1, 9)))
+        self.assertFalse(intervals.overlaps(datetime(2025, 1, 13), datetime(2025, 2, 1)))
+
+    def test_bulk_details_booked_ranges(self):
+        response = self.client.get('/bulk_details?items=1&items=2')
+        self.assertEqual(response.status_code, 200)
+        for booked_range in response.get_json()["booked_dates"]:
+            self.assertLessEqual(booked_range["from"], booked_range["to"])
+
+    def test_validate_cart_lines_rejects_bad_dates(self):
+        with self.app.app_context():
+            lines, conflicts = validate_cart_lines([
+                {"id": 1, "borrow_date": "2030-01-05", "return_date": "2030-01-01"},
+                {"id": 1, "borrow_date": "not a date", "return_date": "2030-01-01"},
+            ])
+        self.assertEqual(lines, [])
+        self.assertEqual([conflict["line"] for conflict in conflicts], [1, 2])
+
+    def test_file_transport_writes_message(self):
+        with tempfile.TemporaryDirectory() as directory:
+            FileTransport(directory).send({"id": 1, "subject": "Test", "recipients": []})
+            self.assertEqual(len(os.listdir(directory)), 1)
+
+    def test_mailer_times_out_before_the_claim_lease(self):
+        self.addCleanup(setattr, main, '_mailer', None)
+        main._mailer = None
+        with mock.patch('mailersend.MailerSendClient') as client, \
+             mock.patch.dict(self.app.config, OUTBOX_SEND_TIMEOUT=3600):
+            main.get_mailer()
+        kwargs = client.call_args.kwargs
+        self.assertEqual(kwargs['max_retries'], 0)
+        self.assertLess(kwargs['timeout'], main.OUTBOX_LEASE.total_seconds())
+
+    def test_deny_email_keeps_media_queries(self):
+        context = dict(borrower_name='Borrower', note='Busy that week', bookings=[], items=[], now=datetime.now())
+        with self.app.app_context():
+            html = render_template('email_deny.html', **context)
+        # The mobile overrides stay in <style>, mail clients that support them apply them
+        self.assertIn('@media only screen and (max-width: 640px)', html)
+        self.assertIn('.table-container img {', html)
+        self.assertIn('Busy that week', html)
+
+    def test_bookings_counts_cache_is_bounded(self):
+        with self.app.test_request_context():
+            for borrower in range(BOOKINGS_COUNTS_MAX + 50):
+                count_bookings(Booking.query.filter(Booking.borrower_name == str(borrower)), ('', str(borrower), ''))
+            self.assertEqual(len(main._bookings_counts), BOOKINGS_COUNTS_MAX)
+            self.assertIn(('', str(BOOKINGS_COUNTS_MAX + 49), ''), main._bookings_counts)
+
+    def test_bookings_list_data_requires_admin(self):
+        response = self.client.get('/bookings_list/data?draw=1&start=0&length=10')
+        self.assertEqual(response.status_code, 403)
+
+    def test_scheduled_jobs_have_valid_triggers(self):
+        for job_id, (func, cron) in SCHEDULED_JOBS.items():
+            self.assertTrue(callable(func), job_id)
+            CronTrigger(**cron)
+
+    def test_configure_app_refuses_another_database(self):
+        self.assertIs(configure_app({'TESTING': True}), self.app)
+        with self.assertRaises(RuntimeError):
+            configure_app({'SQLALCHEMY_DATABASE_URI': 'sqlite:///elsewhere.db'})
+
+    def test_configure_app_only_configures(self):
+        threshold = self.app.config['SQL_PROFILER_REPEAT_THRESHOLD']
+        self.addCleanup(self.app.config.update, SQL_PROFILER_REPEAT_THRESHOLD=threshold)
+        threads = threading.active_count()
+
+        self.assertIs(configure_app({'SQL_PROFILER_REPEAT_THRESHOLD': threshold + 1}), self.app)
+        self.assertEqual(self.app.config['SQL_PROFILER_REPEAT_THRESHOLD'], threshold + 1)
+        # No threads started and no module posing as MySQLdb
+        self.assertEqual(threading.active_count(), threads)
+        self.assertNotIn('MySQLdb', sys.modules)
+
+    def test_scheduler_leader_steps_down_when_renewal_fails(self):
+        leader               = SchedulerLeader()
+        leader.lease_seconds = 90
+        leader.scheduler     = mock.Mock()
+        leader.is_leader     = True
+
+        def unreachable(lease_seconds):
+            leader.stopped.set()
+            raise OperationalError('UPDATE scheduler_lease', {}, Exception('gone away'))
+
+        with mock.patch('main.acquire_scheduler_lease', side_effect=unreachable):
+            leader._run(self.app)
+        self.assertFalse(leader.is_leader)
+        leader.scheduler.pause.assert_called_once()
+
+    def test_request_profile_flags_repeated_statements(self):
+        profile = RequestProfile()
+        for item_id in range(6):
+            profile.record(f"SELECT * FROM booking WHERE item_id IN ({', '.join(['?'] * (item_id + 1))})", 0.001)
+        self.assertEqual(profile.count, 6)
+        self.assertEqual(profile.repeated(5), [("SELECT * FROM booking WHERE item_id IN (?)", 6)])
+
+    def test_sql_profile_groups_unmatched_paths(self):
+        with mock.patch.dict(self.app.config, SQL_PROFILER=True):
+            for number in range(3):
+                self.client.get(f'/no-such-page-{number}')
+        self.assertIn('<unmatched>', main._sql_profile_routes)
+        self.assertFalse(any(route.startswith('/no-such-page') for route in main._sql_profile_routes))
+
+    def test_metrics_render_histogram(self):
+        registry = Metrics()
+        registry.observe('booking_http_request_duration_seconds', 0.02, endpoint='home')
+        registry.inc('booking_bookings_created_total', 3)
+        text = registry.render()
+        self.assertIn('booking_http_request_duration_seconds_bucket{endpoint="home",le="0.025"} 1', text)
+        self.assertIn('booking_http_request_duration_seconds_bucket{endpoint="home",le="0.01"} 0', text)
+        self.assertIn('booking_bookings_created_total 3', text)
+
+    def test_metrics_retire_dead_worker_counters(self):
+        with tempfile.TemporaryDirectory() as directory:
+            registry = Metrics()
+            registry.configure(directory)
+            registry.inc('booking_bookings_created_total', 2)
+            # pid beyond pid_max, never alive
+            with open(os.path.join(directory, '99999999-1.json'), 'w') as file:
+                json.dump({"worker": f'{socket.gethostname()}:99999999', "values": [
+                    ['booking_bookings_created_total', [], 5],
+                    ['booking_scheduler_job_last_success_seconds', [['job', 'send_reminders']], 1700000000]]}, file)
+
+            for _ in range(2):
+                merged = registry.collect()
+                self.assertEqual(merged[('booking_bookings_created_total', ())], 7)
+                self.assertNotIn(('booking_scheduler_job_last_success_seconds', (('job', 'send_reminders'),)), merged)
+            self.assertFalse(os.path.exists(os.path.join(directory, '99999999-1.json')))
+
+    def test_microsoft_login_with_stub_authority(self):
+        authority = StubAuthority("https://authority.test/tenant", "client")
+        self.app.config.update(MSAL_AUTHORITY=authority.authority, MSAL_HTTP_CLIENT=authority,
+                               MSAL_HTTP_CACHE_FILE=None, AZURE_CLIENT_ID="client", AZURE_CLIENT_SECRET="secret")
+        reset_msal_app()
+        try:
+            for _ in range(2):
+                response = self.client.get('/login_microsoft')
+                query = parse_qs(urlparse(response.headers["Location"]).query)
+                authority.nonce = query["nonce"][0]
+                response = self.client.get(f'/getAToken?code=stub&state={query["state"][0]}')
+                self.assertEqual(response.status_code, 302)
+                with self.client.session_transaction() as client_session:
+                    self.assertEqual(client_session["user_email"], "stub.user@lmta.lt")
+
+            # Discovery happened once, each login only posted its code
+            self.assertEqual(sum("openid-configuration" in url for url in authority.requests), 1)
+            self.assertEqual(sum(url.endswith("/token") for url in authority.requests), 2)
+        finally:
+            self.app.config.update(MSAL_AUTHORITY=None, MSAL_HTTP_CLIENT=None)
+            reset_msal_app()
+
+    def test_msal_http_cache_saved_once_and_atomically(self):
+        with tempfile.TemporaryDirectory() as directory, \
+                mock.patch.object(main, '_msal_http_cache_saver', False), \
+                mock.patch.object(main, '_msal_http_cache', None), \
+                mock.patch.object(main.atexit, 'register') as register:
+            path = os.path.join(directory, 'msal_http_cache.bin')
+            main._load_msal_http_cache(path)
+            main._load_msal_http_cache(path)["discovery"] = "response"
+            register.assert_called_once_with(main._save_msal_http_cache)
+
+            main._save_msal_http_cache()
+            self.assertEqual(os.listdir(directory), ['msal_http_cache.bin'])
+            self.assertEqual(main._load_msal_http_cache(path), {"discovery": "response"})
+
+    def test_calendar_events_window_and_etag(self):
+        self.assertEqual(self.client.get('/api/calendar?start=2025-02-01').status_code, 400)
+        response = self.client.get('/api/calendar?start=2025-01-27T00:00:00&end=2025-03-10T00:00:00')
+        self.assertEqual(response.status_code, 200)
+        for event in response.get_json():
+            self.assertLess(event["start"], "2025-03-10")
+            self.assertGreater(event["end"], "2025-01-27")
+        cached = self.client.get('/api/calendar?start=2025-01-27&end=2025-03-10',
+                                 headers={'If-None-Match': response.headers['ETag']})
+        self.assertEqual(cached.status_code, 304)
+
+    def test_search_items_pages_and_filters(self):
+        response = self.client.get('/api/items?q=a&status=available&length=5')
+        self.assertEqual(response.status_code, 200)
+        result = response.get_json()
+        self.assertLessEqual(len(result["data"]), 5)
+        self.assertLessEqual(result["recordsFiltered"], result["recordsTotal"])
+        for item in result["data"]:
+            self.assertEqual(item["status"], 'available')
+            self.assertTrue(item["name"].lower().startswith('a') or item["location"].lower().startswith('a'))
+
+    def test_photo_srcset_lists_stored_widths(self):
+        # Copies made before photo_widths changed keep their own widths
+        with self.app.test_request_context(), mock.patch.dict(self.app.config, PHOTO_WIDTHS=(200, 400, 800)):
+            srcset = photo_srcset('0123456789abcdef0123-640.jpg', '160,320,640')
+            self.assertEqual([entry.split(' ')[1] for entry in srcset.split(', ')], ['160w', '320w', '640w'])
+            self.assertIn('0123456789abcdef0123-320.jpg 320w', srcset)
+            self.assertEqual(photo_srcset('old_photo.png', ''), '')
+
+    def test_catalog_follows_commits_and_rollbacks(self):
+        admin_id, = self.add_rows(User(username='catalog.admin@lmta.lt', password='-', is_admin=True))
+        item_id, = self.add_rows(Item(name='Catalog old', location='Test'))
+        # Rows added here bypass add_item() and delete_item(), bump the version like they do
+        self.bump_catalog()
+        self.addCleanup(self.bump_catalog)
+        name = lambda: {item.id: item.name for item in get_catalog()}[item_id]
+        with self.app.app_context():
+            self.assertEqual(name(), 'Catalog old')
+
+        self.login(admin_id)
+        self.client.post(f'/edit_item/{item_id}', data={'name': 'Catalog new', 'location': 'Test'})
+        with self.app.app_context():
+            self.assertEqual(name(), 'Catalog new')
+
+        # Until it commits or rolls back, the writer reads its own changes past the shared copy
+        with self.app.app_context():
+            db.session.get(Item, item_id).name = 'Catalog committed'
+            bump_data_version('catalog')
+            self.assertEqual(name(), 'Catalog committed')
+            self.assertIsNot(get_catalog(), main._catalog[1])
+            db.session.commit()
+            self.assertEqual(name(), 'Catalog committed')
+            self.assertIs(get_catalog(), main._catalog[1])
+
+        with self.app.app_context():
+            db.session.get(Item, item_id).name = 'Catalog rolled back'
+            bump_data_version('catalog')
+            self.assertEqual(name(), 'Catalog rolled back')
+            db.session.rollback()
+            self.assertEqual(name(), 'Catalog committed')
+            self.assertIs(get_catalog(), main._catalog[1])
+
+    def bump_catalog(self):
+        with self.app.app_context():
+            bump_data_version('catalog')
+            db.session.commit()
+
+    def test_ics_line_folds_long_lines(self):
+        folded = ics_line('SUMMARY:' + 'ą' * 60)
+        for line in folded.split('\r\n'):
+            self.assertLessEqual(len(line.encode('utf-8')), 75)
+        self.assertEqual(folded.replace('\r\n ', ''), 'SUMMARY:' + 'ą' * 60 + '\r\n')
+
+    def test_bookings_archive_requires_admin(self):
+        response = self.client.get('/bookings_archive?year=2024')
+        self.assertEqual(response.status_code, 403)
+
+    def test_revoked_admin_is_refused_by_other_workers(self):
+        user_id, = self.add_rows(User(username='revoked.admin@lmta.lt', password='-', is_admin=True))
+        self.login(user_id)
+        self.assertEqual(self.client.get('/bookings_archive').status_code, 200)
+
+        held_elsewhere, version_elsewhere = main._user_cache[user_id], main._users_version
+        with self.app.app_context():
+            db.session.get(User, user_id).is_admin = False
+            db.session.commit()
+        # Another worker still has the admin in its cache, and rechecks the version after a while
+        main._user_cache[user_id] = held_elsewhere
+        main._users_version = (version_elsewhere[0] - self.app.config['USER_VERSION_SECONDS'], version_elsewhere[1])
+        self.assertEqual(self.client.get('/bookings_archive').status_code, 403)
+
+    def test_cached_user_costs_no_query(self):
+        user_id, = self.add_rows(User(username='cached.user@lmta.lt', password='-'))
+        self.login(user_id)
+        self.client.get('/about')
+
+        statements = []
+        record = lambda *args: statements.append(args[2])
+        with self.app.app_context():
+            engine = db.engine
+        event.listen(engine, 'before_cursor_execute', record)
+        self.addCleanup(event.remove, engine, 'before_cursor_execute', record)
+        self.assertEqual(self.client.get('/about').status_code, 200)
+        self.assertEqual(statements, [])
+
+    def test_reminder_job_queues_once_per_borrower(self):
+        due = datetime.now().replace(hour=12, minute=0, second=0, microsecond=0) + timedelta(days=1)
+        item_id, = self.add_rows(Item(name='Reminder test item', location='Test'))
+        self.add_rows(*[Booking(item_id=item_id, item_name='Reminder test item', borrower_name=name,
+                                borrower_email=email, user_email=email, borrower_phone='0',
+                                borrow_date=due - timedelta(days=3), return_date=due, status='lent')
+                        for name, email in [('One', 'reminder.one@lmta.lt'), ('One', 'reminder.one@lmta.lt'),
+                                            ('Two', 'reminder.two@lmta.lt')]])
+        with self.app.app_context():
+            last_outbox = db.session.query(db.func.max(EmailOutbox.id)).scalar() or 0
+            last_ledger = db.session.query(db.func.max(ReminderLedger.id)).scalar() or 0
+        self.addCleanup(self.delete_newer_than, EmailOutbox, last_outbox)
+        self.addCleanup(self.delete_newer_than, ReminderLedger, last_ledger)
+
+        check_and_send_reminders_tomorrow()
+        check_and_send_reminders_tomorrow()
+
+        with self.app.app_context():
+            # An overlapping run that read the bookings before the ledger rows were committed
+            booking_ids = [booking.id for booking in Booking.query.filter(Booking.item_id == item_id)]
+            self.assertEqual(_claim_reminders(booking_ids, datetime.now().date(), 'overlapping run'), set())
+            db.session.commit()
+
+            for email in ('reminder.one@lmta.lt', 'reminder.two@lmta.lt'):
+                queued = EmailOutbox.query.filter(EmailOutbox.id > last_outbox, EmailOutbox.type_of_mail == 'return_reminder',
+                                                  EmailOutbox.recipients.contains(email)).count()
+                self.assertEqual(queued, 1)
+
+    def delete_newer_than(self, model, last_id):
+        with self.app.app_context():
+            model.query.filter(model.id > last_id).delete(synchronize_session=False)
+            db.session.commit()
+
+    def test_cart_add_remove_and_book(self):
+        item_id, = self.add_rows(Item(name='Cart test item', location='Test'))
+        user_id, = self.add_rows(User(username='cart.user@lmta.lt', password='-'))
+        with self.app.app_context():
+            last_outbox = db.session.query(db.func.max(EmailOutbox.id)).scalar() or 0
+        self.addCleanup(self.delete_newer_than, EmailOutbox, last_outbox)
+        self.addCleanup(self.delete_cart_data, item_id, user_id)
+        self.login(user_id)
+
+        # Far in the future, clear of any real booking
+        start = datetime.now().date() + timedelta(days=400)
+        posted = [{"id": item_id, "borrow_date": str(start + timedelta(days=offset)),
+                   "return_date": str(start + timedelta(days=offset + 1))} for offset in (0, 10)]
+        response = self.client.post('/book_cart', data={'borrower_name': 'Cart User', 'borrower_email': 'cart.user@lmta.lt',
+                                                        'borrower_phone': '0', 'itemsJSON': json.dumps(posted)})
+        self.assertEqual(response.status_code, 302)
+        with self.app.app_context():
+            line_ids = [line.id for line in CartLine.query.join(Cart).filter(Cart.user_id == user_id).order_by(CartLine.id)]
+        self.assertEqual(len(line_ids), 2)
+
+        self.client.get(f'/remove_from_cart/{line_ids[0]}')
+
+        # The posted itemsJSON still lists both lines, the cart store wins
+        response = self.client.post('/book?from_cart=1', data={'itemsJSON': json.dumps(posted)})
+        self.assertEqual(response.status_code, 302)
+        with self.app.app_context():
+            booked = [booking.borrow_date.date() for booking in Booking.query.filter_by(item_id=item_id)]
+            self.assertEqual(booked, [start + timedelta(days=10)])
+            self.assertEqual(CartLine.query.join(Cart).filter(Cart.user_id == user_id).count(), 0)
+
+    def delete_cart_data(self, item_id, user_id):
+        with self.app.app_context():
+            Booking.query.filter_by(item_id=item_id).delete(synchronize_session=False)
+            cart_ids = [cart.id for cart in Cart.query.filter_by(user_id=user_id)]
+            CartLine.query.filter(CartLine.cart_id.in_(cart_ids)).delete(synchronize_session=False)
+            Cart.query.filter(Cart.id.in_(cart_ids)).delete(synchronize_session=False)
+            db.session.commit()
+
+    def test_item_status_follows_book_lend_and_return(self):
+        item_id,  = self.add_rows(Item(name='Status test item', location='Test'))
+        admin_id, = self.add_rows(User(username='status.admin@lmta.lt', password='-', is_admin=True))
+        with self.app.app_context():
+            last_outbox = db.session.query(db.func.max(EmailOutbox.id)).scalar() or 0
+        self.addCleanup(self.delete_newer_than, EmailOutbox, last_outbox)
+        self.addCleanup(self.delete_cart_data, item_id, admin_id)
+        self.login(admin_id)
+
+        def status():
+            with self.app.app_context():
+                item = db.session.get(Item, item_id)
+                return item.status, item.current_booking_id
+
+        today = datetime.now().date()
+        posted = [{"id": item_id, "borrow_date": str(today), "return_date": str(today + timedelta(days=1))}]
+        self.client.post('/book_cart', data={'borrower_name': 'Status User', 'borrower_email': 'status.admin@lmta.lt',
+                                             'borrower_phone': '0', 'itemsJSON': json.dumps(posted)})
+        self.client.post('/book?from_cart=1')
+        with self.app.app_context():
+            booking_id, = [booking.id for booking in Booking.query.filter_by(item_id=item_id)]
+        self.addCleanup(self.delete_archived, [booking_id])
+        self.assertEqual(status(), ('booked', None))
+
+        self.client.get(f'/lend/{booking_id}')
+        self.assertEqual(status(), ('lent', booking_id))
+
+        self.client.get(f'/return/{booking_id}')
+        self.assertEqual(status(), ('available', None))
+
+    def test_promotion_marks_started_bookings(self):
+        item_id, = self.add_rows(Item(name='Promotion test item', location='Test'))
+        now = datetime.now()
+        # Booked ahead of time: nothing refreshed the item when the booking started
+        self.add_rows(Booking(item_id=item_id, item_name='Promotion test item', borrower_name='P',
+                              borrower_email='promotion.p@lmta.lt', user_email='p', borrower_phone='0',
+                              borrow_date=now - timedelta(hours=1), return_date=now + timedelta(days=1)))
+        with self.app.app_context():
+            self.assertEqual(db.session.get(Item, item_id).status, 'available')
+            self.assertIn(item_id, promote_item_statuses())
+            self.assertEqual(db.session.get(Item, item_id).status, 'booked')
+
+    def test_purge_stale_carts(self):
+        stale_id, fresh_id = self.add_rows(Cart(updated_at=datetime.now() - timedelta(days=40)), Cart())
+        self.add_rows(CartLine(cart_id=stale_id, item_id=1, borrow_date=datetime.now().date(),
+                               return_date=datetime.now().date()))
+        purge_stale_carts()
+        with self.app.app_context():
+            self.assertIsNone(db.session.get(Cart, stale_id))
+            self.assertEqual(CartLine.query.filter_by(cart_id=stale_id).count(), 0)
+            self.assertIsNotNone(db.session.get(Cart, fresh_id))
+
+    def test_return_item_archives_booking(self):
+        admin_id, = self.add_rows(User(username='archive.admin@lmta.lt', password='-', is_admin=True))
+        item_id,  = self.add_rows(Item(name='Archive test item', location='Test'))
+        borrow_date = datetime(2019, 3, 4)
+        booking_id, = self.add_rows(Booking(item_id=item_id, item_name='Archive test item', borrower_name='A',
+                                            borrower_email='archive.a@lmta.lt', user_email='a', borrower_phone='0',
+                                            borrow_date=borrow_date, return_date=borrow_date + timedelta(days=2), status='lent'))
+        self.addCleanup(self.delete_archived, [booking_id])
+        self.login(admin_id)
+
+        self.client.get(f'/return/{booking_id}', headers={'Referer': '/bookings_list'})
+
+        with self.app.app_context():
+            self.assertIsNone(db.session.get(Booking, booking_id))
+            archived = BookingArchive.query.filter_by(booking_id=booking_id).one()
+            self.assertEqual((archived.outcome, archived.status, archived.year), ('returned', 'lent', 2019))
+
+        response = self.client.get(f'/bookings_archive?year=2019&item={item_id}')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b'<td>3</td>', response.data)     # loan days, both ends included
+
+    def test_bulk_bookings_requires_admin(self):
+        response = self.client.post('/bookings/bulk', json={'action': 'deny', 'booking_ids': [1]})
+        self.assertEqual(response.status_code, 403)
+
+    def test_bulk_bookings_with_mixed_statuses(self):
+        admin_id, = self.add_rows(User(username='bulk.admin@lmta.lt', password='-', is_admin=True))
+        item_id,  = self.add_rows(Item(name='Bulk test item', location='Test'))
+        start = datetime.now() + timedelta(days=400)
+
+        def booking(offset, email, status):
+            return Booking(item_id=item_id, item_name='Bulk test item', borrower_name=email, borrower_email=email,
+                           user_email=email, borrower_phone='0', borrow_date=start + timedelta(days=offset),
+                           return_date=start + timedelta(days=offset + 1), status=status)
+
+        first, second, lent, third = self.add_rows(booking(0, 'bulk.one@lmta.lt', 'booked'), booking(3, 'bulk.one@lmta.lt', 'booked'),
+                                                   booking(6, 'bulk.two@lmta.lt', 'lent'),   booking(9, 'bulk.two@lmta.lt', 'booked'))
+        with self.app.app_context():
+            last_outbox = db.session.query(db.func.max(EmailOutbox.id)).scalar() or 0
+        self.addCleanup(self.delete_newer_than, EmailOutbox, last_outbox)
+        self.addCleanup(self.delete_archived, [first, second, lent, third])
+        self.login(admin_id)
+
+        result = self.client.post('/bookings/bulk', json={'action': 'deny', 'note': 'Closed',
+                                                          'booking_ids': [first, second, lent, third]}).get_json()
+        self.assertEqual((result['done'], result['skipped']), ([first, second, third], [lent]))
+        result = self.client.post('/bookings/bulk', json={'action': 'return', 'booking_ids': [lent, first]}).get_json()
+        self.assertEqual((result['done'], result['skipped']), ([lent], [first]))
+
+        with self.app.app_context():
+            self.assertEqual(Booking.query.filter_by(item_id=item_id).count(), 0)
+            archived = {row.booking_id: (row.outcome, row.note) for row in BookingArchive.query.filter(
+                BookingArchive.booking_id.in_([first, second, lent, third]))}
+            self.assertEqual(archived, {first: ('denied', 'Closed'), second: ('denied', 'Closed'),
+                                        third: ('denied', 'Closed'), lent: ('returned', None)})
+            for email in ('bulk.one@lmta.lt', 'bulk.two@lmta.lt'):
+                denials = EmailOutbox.query.filter(EmailOutbox.id > last_outbox, EmailOutbox.type_of_mail == 'deny',
+                                                   EmailOutbox.recipients.contains(email)).count()
+                self.assertEqual(denials, 1)
+
+    def test_delete_bulk_requires_admin(self):
+        response = self.client.post('/delete_bulk', json={'item_ids': [1]})
+        self.assertEqual(response.status_code, 403)
+
+    def test_delete_bulk_reports_and_archives(self):
+        admin_id, = self.add_rows(User(username='delete.admin@lmta.lt', password='-', is_admin=True))
+        spare_id, busy_id, used_id = self.add_rows(Item(name='Spare', location='Test'), Item(name='Busy', location='Test'),
+                                                   Item(name='Used', location='Test'))
+        now = datetime.now()
+        future_id, past_id = self.add_rows(
+            Booking(item_id=busy_id, item_name='Busy', borrower_name='B', borrower_email='delete.b@lmta.lt', user_email='b',
+                    borrower_phone='0', borrow_date=now + timedelta(days=5), return_date=now + timedelta(days=6)),
+            Booking(item_id=used_id, item_name='Used', borrower_name='B', borrower_email='delete.b@lmta.lt', user_email='b',
+                    borrower_phone='0', borrow_date=now - timedelta(days=9), return_date=now - timedelta(days=8)))
+        cart_id, = self.add_rows(Cart())
+        self.add_rows(CartLine(cart_id=cart_id, item_id=spare_id, borrow_date=now.date(), return_date=now.date()))
+        self.addCleanup(self.delete_archived, [past_id])
+        self.login(admin_id)
+
+        response = self.client.post('/delete_bulk', json={'item_ids': [spare_id, busy_id, used_id, 99999999]})
+        results = {result['id']: result['result'] for result in response.get_json()['results']}
+        self.assertEqual(results, {spare_id: 'deleted', busy_id: 'active', used_id: 'deleted', 99999999: 'missing'})
+
+        with self.app.app_context():
+            self.assertEqual([item.id for item in Item.query.filter(Item.id.in_([spare_id, busy_id, used_id]))], [busy_id])
+            self.assertIsNotNone(db.session.get(Booking, future_id))
+            self.assertIsNone(db.session.get(Booking, past_id))
+            self.assertEqual([archived.outcome for archived in BookingArchive.query.filter_by(booking_id=past_id)], ['item deleted'])
+            self.assertEqual(CartLine.query.filter_by(cart_id=cart_id).count(), 0)
+
+    def delete_archived(self, booking_ids):
+        with self.app.app_context():
+            BookingArchive.query.filter(BookingArchive.booking_id.in_(booking_ids)).delete(synchronize_session=False)
+            db.session.commit()
+
     def test_login_page(self):
         response = self.client.get('/login')
         self.assertEqual(response.status_code, 200)